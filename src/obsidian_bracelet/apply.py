@@ -1,72 +1,161 @@
 from __future__ import annotations
-import json
+import os
+import platform
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable
 
-def _ensure_parent(p: Path):
-    p.parent.mkdir(parents=True, exist_ok=True)
+from .planner import _IO_WORKERS, _TEXT_EXTS, _suffix
 
-def _copy(src: Path, dest: Path):
-    _ensure_parent(dest)
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+def _ensure_parent(p: str | Path, created_dirs: set[str] | None = None):
+    # created_dirs holds directories already known to exist (per apply_plan run)
+    parent = os.path.dirname(p)
+    if parent and (created_dirs is None or parent not in created_dirs):
+        os.makedirs(parent, exist_ok=True)
+        if created_dirs is not None:
+            created_dirs.add(parent)
+
+# FICLONE from linux/fs.h: share the source's extents (btrfs, XFS) instead of copying data.
+# It is _IOW(0x94, 9, int), whose direction bits are arch-specific: 0x80049409 on
+# powerpc, mips, sparc and alpha, 0x40049409 elsewhere (x86, arm, riscv, s390)
+_FICLONE = (0x80049409 if platform.machine().lower().startswith(("ppc", "powerpc", "mips", "sparc", "alpha"))
+            else 0x40049409)
+
+def _reflink(src_fd: int, dest_fd: int) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dest_fd, _FICLONE, src_fd)
+        return True
+    except OSError:
+        return False  # different filesystem or no reflink support
+
+def _fast_copy(src: str | Path, dest: str | Path, hardlink: bool = False):
+    # Hardlink when requested (same filesystem only), else reflink or copy_file_range so the
+    # kernel copies without user-space buffers; copy2 as fallback.
+    try:
+        if os.path.samefile(src, dest):
+            return  # already hardlinked by an earlier apply; opening dest for writing would truncate src
+    except OSError:
+        pass  # dest does not exist yet
+    if hardlink:
+        try:
+            os.link(src, dest)
+            return
+        except OSError:
+            pass  # cross-device, dest exists, or links unsupported
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                if _reflink(fsrc.fileno(), fdst.fileno()):
+                    remaining = 0
+                while remaining > 0:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            if remaining == 0:
+                shutil.copystat(src, dest)
+                return
+        except OSError:
+            pass  # unsupported by filesystem or kernel
+    shutil.copy2(src, dest)
+
+def _copy(src: str | Path, dest: str | Path, hardlink: bool = False,
+          created_dirs: set[str] | None = None) -> str | None:
+    # Accepts plain strings so apply_plan can pass plan paths through without wrapping them.
+    # Returns the decoded text of markdown files that contain links, None otherwise.
+    _ensure_parent(dest, created_dirs)
     try:
-        if src.suffix.lower() == '.md':
-            content = src.read_text(encoding="utf-8", errors="ignore")
-            content = _update_links(content)
-            dest.write_text(content, encoding="utf-8")
+        if os.path.splitext(src)[1].lower() == '.md':
+            with open(src, "rb") as f:
+                data = f.read()
+            updated = None
+            if b'[[' in data or b'](' in data:
+                content = data.decode("utf-8", errors="ignore")
+                updated = _update_links(content)
+                if updated != content:
+                    # Decoded from raw bytes, so line endings are still the source's; write them untranslated
+                    with open(dest, "w", encoding="utf-8", newline="") as f:
+                        f.write(updated)
+                    return updated
+            # No links rewritten: write the bytes already read instead of copying src again
+            with open(dest, "wb") as f:
+                f.write(data)
+            shutil.copystat(src, dest)
+            return updated
         else:
-            shutil.copy2(src, dest)
+            # Only assets may be hardlinked; notes stay independent of their source vault
+            _fast_copy(src, dest, hardlink=hardlink)
     except (OSError, PermissionError, IOError) as e:
         # Try to create a placeholder file if copy fails
         try:
-            placeholder = f"# Copy Failed\n\nCould not copy {src.name}\nError: {e}"
-            dest.write_text(placeholder, encoding="utf-8")
+            placeholder = f"# Copy Failed\n\nCould not copy {os.path.basename(src)}\nError: {e}"
+            with open(dest, "w", encoding="utf-8") as f:
+                f.write(placeholder)
         except Exception:
             pass  # If even placeholder fails, skip silently
 
+# Wiki links [[link]] and markdown links [text](link), matched in a single scan
+_LINK_RE = re.compile(r'\[\[([^\]]+)\]\]|\[([^\]]+)\]\(([^)]+)\)')
+def _replace_md_link(match):
+    link = match.group(3)
+    if not link.startswith(('http://', 'https://', '#')) and '.' in link:
+        # Assume moved to !res if not md/txt
+        if _suffix(link) not in _TEXT_EXTS:
+            return f'[{match.group(2)}](!res/{link})'
+    return match.group(0)
+
+def _replace_wiki_link(match):
+    link = match.group(1).split('|')[0]
+    if '.' in link and _suffix(link) not in _TEXT_EXTS:
+        return f'[[!res/{link}]]'
+    return match.group(0)
+
+def _replace_link(match):
+    if match.group(1) is not None:
+        return _replace_wiki_link(match)
+    return _replace_md_link(match)
+
 def _update_links(content: str) -> str:
-    # Update links to files moved to !res
-    def replace_link(match):
-        link = match.group(2)
-        if not link.startswith(('http://', 'https://', '#')) and '.' in link:
-            # Assume moved to !res if not md/txt
-            path = Path(link)
-            if path.suffix.lower() not in ('.md', '.txt'):
-                return f'[{match.group(1)}](!res/{link})'
-        return match.group(0)
-    # Update markdown links
-    content = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', replace_link, content)
-    # Update wiki links if they have extensions
-    def replace_wiki(match):
-        link = match.group(1).split('|')[0]
-        if '.' in link and Path(link).suffix.lower() not in ('.md', '.txt'):
-            return f'[[!res/{link}]]'
-        return match.group(0)
-    content = re.sub(r'\[\[([^\]]+)\]\]', replace_wiki, content)
-    return content
-
-def _merge_markdown(src_a: Path, src_b: Path, dest: Path, vault_a: str, vault_b: str):
+    # Update links to files moved to !res: markdown links, and wiki links if they have extensions
+    if '[[' not in content and '](' not in content:
+        return content  # no links, skip the regex scan
+    updated, count = _LINK_RE.subn(_replace_link, content)
+    # Hand back the original object when nothing matched so callers' equality checks are O(1)
+    return content if count == 0 else updated
+
+_MERGE_DIVIDER = "\n\n---\nFrom {vault}\n---\n\n"
+
+def _merge_markdown(src_a: Path, src_b: Path, dest: Path, vault_a: str, vault_b: str,
+                    created_dirs: set[str] | None = None):
     # Simple merge: frontmatter union (best-effort) + concatenate bodies with divider.
     # Placeholder MVP; a later step will implement proper frontmatter merge.
-    _ensure_parent(dest)
+    _ensure_parent(dest, created_dirs)
     try:
-        a = src_a.read_text(encoding="utf-8", errors="ignore")
+        a = _update_links(src_a.read_text(encoding="utf-8", errors="ignore"))
     except Exception as e:
         a = f"# Error reading {vault_a} file\n\nCould not read file: {e}"
     
     try:
-        b = src_b.read_text(encoding="utf-8", errors="ignore")
+        b = _update_links(src_b.read_text(encoding="utf-8", errors="ignore"))
     except Exception as e:
         b = f"# Error reading {vault_b} file\n\nCould not read file: {e}"
     
-    a = _update_links(a)
-    b = _update_links(b)
-    divider_a = f"\n\n---\nFrom {vault_a}\n---\n\n"
-    divider_b = f"\n\n---\nFrom {vault_b}\n---\n\n"
+    divider_a = _MERGE_DIVIDER.format(vault=vault_a)
+    divider_b = _MERGE_DIVIDER.format(vault=vault_b)
     
     try:
-        dest.write_text(divider_a + a + divider_b + b, encoding="utf-8")
+        # Single join instead of chained + so large notes are not copied into intermediates
+        dest.write_text("".join((divider_a, a, divider_b, b)), encoding="utf-8")
     except Exception as e:
         # If merge fails, create individual files
         try:
@@ -82,67 +171,147 @@ def _merge_settings(sources: list[Path], dest_dir: Path):
     dest_dir.mkdir(parents=True, exist_ok=True)
     # TODO: implement deep JSON merge for .obsidian files (app.json, core-plugins.json, community-plugins.json, hotkeys.json, etc.)
 
+def _compile_link_updates(link_updates: dict, target_root: Path):
+    # Build one alternation over all wiki [[old]] and markdown ](old) forms so each file is scanned once
+    replacements = {}
+    for old_path, new_path in link_updates.items():
+        old_rel = Path(old_path).relative_to(target_root)
+        new_rel = Path(new_path).relative_to(target_root)
+        replacements[f"[[{old_rel}]]"] = f"[[{new_rel}]]"
+        replacements[f"]({old_rel})"] = f"]({new_rel})"
+    if not replacements:
+        return None, replacements
+    # Longest first so a path never shadows a longer one sharing its prefix
+    keys = sorted(replacements, key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in keys)), replacements
+
+def _cached_link_updates(link_updates: dict, target_root: Path, cache: dict):
+    # Keyed by content so actions with equal mappings share one pattern
+    key = tuple(link_updates.items())
+    entry = cache.get(key)
+    if entry is None:
+        entry = cache[key] = _compile_link_updates(link_updates, target_root)
+    return entry
+
+# Actions run in phases: each phase depends on files written by the previous ones,
+# while actions within a file-writing phase touch distinct destinations and can run concurrently.
+_SERIAL_PHASES = (("mkdir",), ("merge_settings",))
+_ACTION_PHASES = (
+    ("mkdir",),
+    ("copy", "rename_copy", "merge_markdown", "create_link_file"),
+    ("merge_settings",),
+    ("update_file_links",),
+)
+_FILE_ACTIONS = frozenset(("copy", "rename_copy", "merge_markdown", "create_link_file"))
+
+# Action handlers share one signature; run holds per-apply state (see apply_plan)
+def _do_mkdir(act: dict, target_root: Path, dry_run: bool, run: dict):
+    if dry_run: return
+    target_root.mkdir(parents=True, exist_ok=True)
+
+def _do_copy(act: dict, target_root: Path, dry_run: bool, run: dict):
+    if not dry_run:
+        text = _copy(act["src"], act["dest"], hardlink=run["hardlink_assets"],
+                     created_dirs=run["created_dirs"])
+        content_cache = run["content_cache"]
+        if text is not None and act["dest"] in content_cache:
+            content_cache[act["dest"]] = text
+
+def _do_merge_markdown(act: dict, target_root: Path, dry_run: bool, run: dict):
+    src_a = Path(act["src_a"])
+    src_b = Path(act["src_b"])
+    dest = Path(act["dest"])
+    vault_a = act.get("vault_a", "Vault A")
+    vault_b = act.get("vault_b", "Vault B")
+    if not dry_run:
+        _merge_markdown(src_a, src_b, dest, vault_a, vault_b, created_dirs=run["created_dirs"])
+
+def _do_merge_settings(act: dict, target_root: Path, dry_run: bool, run: dict):
+    sources = [Path(s) for s in act["sources"]]
+    dest_dir = Path(act["dest"])
+    if not dry_run:
+        _merge_settings(sources, dest_dir)
+
+def _do_create_link_file(act: dict, target_root: Path, dry_run: bool, run: dict):
+    dest = Path(act["dest"])
+    link_to = Path(act["link_to"])
+    if not dry_run:
+        _ensure_parent(dest, run["created_dirs"])
+        rel_link = link_to.relative_to(target_root)
+        content = f"# Redirect\n\n[[{rel_link}]]"
+        dest.write_text(content, encoding="utf-8")
+
+def _do_update_file_links(act: dict, target_root: Path, dry_run: bool, run: dict):
+    file_path = Path(act["file"])
+    link_updates = act["link_updates"]
+    # Text left by the copy phase saves re-reading and decoding the file
+    content = None if dry_run else run["content_cache"].pop(act["file"], None)
+    if not dry_run and (content is not None or file_path.exists()):
+        try:
+            pattern, replacements = _cached_link_updates(link_updates, target_root, run["link_patterns"])
+            if content is None:
+                with open(file_path, encoding="utf-8", errors="ignore", newline="") as f:
+                    content = f.read()
+            new_content = pattern.sub(lambda m: replacements[m.group(0)], content) if pattern else content
+            if new_content != content:
+                # Line endings were kept as-is on read, so none are translated on write
+                with open(file_path, "w", encoding="utf-8", newline="") as f:
+                    f.write(new_content)
+        except Exception:
+            pass  # Skip if file can't be updated
+
+_DISPATCH = {
+    "mkdir": _do_mkdir,
+    "copy": _do_copy,
+    "rename_copy": _do_copy,
+    "merge_markdown": _do_merge_markdown,
+    "merge_settings": _do_merge_settings,
+    "create_link_file": _do_create_link_file,
+    "update_file_links": _do_update_file_links,
+}
+
+def _run_jobs(jobs: list, target_root: Path, dry_run: bool, run: dict):
+    for handler, act in jobs:
+        handler(act, target_root, dry_run, run)
+
 def apply_plan(plan: dict, dry_run: bool = False):
-    actions: Iterable[dict] = plan.get("actions", [])
+    actions: Iterable[dict] = list(plan.get("actions", []))
+    by_type = {}
     for act in actions:
-        t = act["type"]
-        if t == "mkdir":
-            if dry_run: continue
-            Path(plan["target_root"]).mkdir(parents=True, exist_ok=True)
-        elif t in ("copy", "rename_copy"):
-            src = Path(act["src"])
-            dest = Path(act["dest"])
-            if not dry_run:
-                _copy(src, dest)
-        elif t == "merge_markdown":
-            src_a = Path(act["src_a"])
-            src_b = Path(act["src_b"])
-            dest = Path(act["dest"])
-            vault_a = act.get("vault_a", "Vault A")
-            vault_b = act.get("vault_b", "Vault B")
-            if not dry_run:
-                _merge_markdown(src_a, src_b, dest, vault_a, vault_b)
-        elif t == "merge_settings":
-            sources = [Path(s) for s in act["sources"]]
-            dest_dir = Path(act["dest"])
-            if not dry_run:
-                _merge_settings(sources, dest_dir)
-        elif t == "create_link_file":
-            dest = Path(act["dest"])
-            link_to = Path(act["link_to"])
-            if not dry_run:
-                _ensure_parent(dest)
-                rel_link = link_to.relative_to(Path(plan["target_root"]))
-                content = f"# Redirect\n\n[[{rel_link}]]"
-                dest.write_text(content, encoding="utf-8")
-        elif t == "update_file_links":
-            file_path = Path(act["file"])
-            link_updates = act["link_updates"]
-            if not dry_run and file_path.exists():
-                try:
-                    content = file_path.read_text(encoding="utf-8", errors="ignore")
-                    updated = False
-                    for old_path, new_path in link_updates.items():
-                        old_rel = Path(old_path).relative_to(Path(plan["target_root"]))
-                        new_rel = Path(new_path).relative_to(Path(plan["target_root"]))
-
-                        # Update wiki links [[old_rel]] -> [[new_rel]]
-                        old_wiki = f"[[{old_rel}]]"
-                        new_wiki = f"[[{new_rel}]]"
-                        if old_wiki in content:
-                            content = content.replace(old_wiki, new_wiki)
-                            updated = True
-
-                        # Update markdown links ](old_rel) -> ](new_rel)
-                        old_md = f"]({old_rel})"
-                        new_md = f"]({new_rel})"
-                        if old_md in content:
-                            content = content.replace(old_md, new_md)
-                            updated = True
-
-                    if updated:
-                        file_path.write_text(content, encoding="utf-8")
-                except Exception:
-                    pass  # Skip if file can't be updated
-        else:
+        by_type.setdefault(act["type"], []).append(act)
+    for t in by_type:
+        if t not in _DISPATCH:
             raise ValueError(f"Unknown action type: {t}")
+    run = {
+        # link_updates items -> compiled pattern, shared by notes that need the same replacements
+        "link_patterns": {},
+        # Text of copied files that a later update_file_links rewrites, dropped once used
+        "content_cache": {act["file"]: None for act in by_type.get("update_file_links", [])},
+        # Opt-in: hardlink non-markdown files instead of copying (edits then affect both vaults)
+        "hardlink_assets": bool(plan.get("hardlink_assets", False)),
+        # Directories known to exist, so file actions skip redundant makedirs calls
+        "created_dirs": set(),
+    }
+    target_root = Path(plan["target_root"])
+    if not dry_run:
+        # Create each destination directory once, parents first, instead of once per file
+        parents = {os.path.dirname(act["dest"]) for t in _FILE_ACTIONS for act in by_type.get(t, [])}
+        for parent in sorted(parents):
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+                run["created_dirs"].add(parent)
+    with ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor:
+        for phase in _ACTION_PHASES:
+            # Plan order, so actions writing the same file end the way a serial run would
+            phase_jobs = [(_DISPATCH[act["type"]], act) for act in actions if act["type"] in phase]
+            if phase in _SERIAL_PHASES or len(phase_jobs) < 2:
+                _run_jobs(phase_jobs, target_root, dry_run, run)
+            else:
+                # The planner does not guarantee unique destinations (e.g. two vaults with the
+                # same folder name): jobs sharing one run serially on a single worker
+                by_dest = {}
+                for job in phase_jobs:
+                    act = job[1]
+                    by_dest.setdefault(act.get("dest", act.get("file")), []).append(job)
+                # Consume the iterator so worker exceptions propagate
+                list(executor.map(lambda jobs: _run_jobs(jobs, target_root, dry_run, run), by_dest.values()))
@@ -1,14 +1,39 @@
 from __future__ import annotations
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import typer
 from rich import print
 
+try:
+    import orjson
+except ImportError:  # orjson ships with the "fast" extra; plans fall back to json
+    orjson = None
+
 app = typer.Typer(add_completion=False, no_args_is_help=True, help="Obsidian vault merger")
 
 def main():
     app()
 
+def _resolve_many(paths: list[Path]) -> list[Path]:
+    # resolve() stats each path component; overlap that latency when vaults sit on slow mounts
+    # Typer already hands us Path objects, so resolve them directly
+    if len(paths) < 2:
+        return [p.resolve() for p in paths]
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+        return list(executor.map(Path.resolve, paths))
+
+def _dump_plan(plan: dict, output: Path):
+    if orjson is not None:
+        output.write_bytes(orjson.dumps(plan, option=orjson.OPT_INDENT_2))
+    else:
+        output.write_bytes(json.dumps(plan, indent=2, ensure_ascii=False).encode("utf-8"))
+
+def _load_plan(plan_file: Path) -> dict:
+    data = plan_file.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 @app.command(help="Scan vaults and build a merge plan (dry-run).")
 def plan(
     source: list[Path] = typer.Option(..., "--source", "-s", exists=True, file_okay=False, dir_okay=True, readable=True, help="Path to a source Obsidian vault (repeatable)"),
@@ -17,8 +42,13 @@ def plan(
     output: Path = typer.Option("merge-plan.json", "--output", "-o", help="Where to write the plan JSON"),
 ):
     from .planner import build_plan
-    plan = build_plan([Path(p).resolve() for p in source], Path(target).resolve(), ignore_patterns=ignore_patterns)
-    output.write_text(json.dumps(plan, indent=2, ensure_ascii=False))
+    # Compile once up front: bad patterns fail fast, and the planner reuses the objects per file
+    try:
+        compiled = [re.compile(p) for p in ignore_patterns]
+    except re.error as e:
+        raise typer.BadParameter(f"invalid regex: {e}", param_hint="--ignore")
+    plan = build_plan(_resolve_many(source), target.resolve(), ignore_patterns=compiled)
+    _dump_plan(plan, output)
     print(f"[green]Wrote plan:[/green] {output}")
 
 @app.command(help="Apply a merge plan JSON file to the target location.")
@@ -27,8 +57,7 @@ def apply(
     dry_run: bool = typer.Option(False, "--dry-run", help="Simulate apply without changing files"),
 ):
     from .apply import apply_plan
-    import json
-    plan = json.loads(Path(plan_file).read_text())
+    plan = _load_plan(plan_file)
     apply_plan(plan, dry_run=dry_run)
 
 @app.command(help="Launch the GUI to review and apply a plan.")
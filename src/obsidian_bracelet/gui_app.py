@@ -0,0 +1,277 @@
+from __future__ import annotations
+from pathlib import Path
+import json
+import os
+import threading
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+
+from .planner import build_plan
+from .apply import apply_plan
+from .gui import _format_actions_by_type, _create_plan_summary, _split_entries, _COMMA_SPLIT_RE
+
+# Rows inserted per mainloop turn when filling the plan table
+_TABLE_CHUNK = 200
+
+class App(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+
+        self.title("Obsidian Bracelet - Vault Merger")
+        self.geometry("1000x800")
+
+        self.sources = []
+
+        # Title
+        self.title_label = ctk.CTkLabel(self, text="Obsidian Bracelet", font=ctk.CTkFont(size=24, weight="bold"))
+        self.title_label.pack(pady=10)
+
+        # Source and Target vaults in two columns
+        self.vaults_frame = ctk.CTkFrame(self)
+        self.vaults_frame.pack(pady=10, padx=20, fill="x")
+
+        # Left column - Source vaults
+        self.source_frame = ctk.CTkFrame(self.vaults_frame)
+        self.source_frame.pack(side="left", fill="both", expand=True, padx=(10,5), pady=10)
+
+        self.source_label = ctk.CTkLabel(self.source_frame, text="Source Vaults:", font=ctk.CTkFont(weight="bold"))
+        self.source_label.pack(anchor="w", padx=10, pady=(10,5))
+
+        self.source_listbox = tk.Listbox(self.source_frame, height=4, font=("Arial", 10), selectmode=tk.EXTENDED)
+        self.source_listbox.pack(fill="both", expand=True, padx=10, pady=(0,5))
+
+        self.source_buttons_frame = ctk.CTkFrame(self.source_frame, fg_color="transparent")
+        self.source_buttons_frame.pack(fill="x", padx=10, pady=(0,10))
+
+        self.add_source_btn = ctk.CTkButton(self.source_buttons_frame, text="Add Source", command=self.add_source)
+        self.add_source_btn.pack(side="left", padx=(0,5))
+
+        self.remove_source_btn = ctk.CTkButton(self.source_buttons_frame, text="Remove", command=self.remove_source, fg_color="red")
+        self.remove_source_btn.pack(side="left")
+
+        # Right column - Target vault
+        self.target_frame = ctk.CTkFrame(self.vaults_frame)
+        self.target_frame.pack(side="right", fill="both", expand=True, padx=(5,10), pady=10)
+
+        self.target_label = ctk.CTkLabel(self.target_frame, text="Target Vault:", font=ctk.CTkFont(weight="bold"))
+        self.target_label.pack(anchor="w", padx=10, pady=(10,5))
+
+        self.target_entry = ctk.CTkEntry(self.target_frame, placeholder_text="Select target folder")
+        self.target_entry.pack(fill="x", padx=10, pady=(0,5))
+
+        self.browse_target_btn = ctk.CTkButton(self.target_frame, text="Browse Target", command=self.browse_target)
+        self.browse_target_btn.pack(pady=(0,10))
+
+        # Ignore patterns
+        self.ignore_frame = ctk.CTkFrame(self)
+        self.ignore_frame.pack(pady=10, padx=20, fill="x")
+
+        self.ignore_label = ctk.CTkLabel(self.ignore_frame, text="Ignore Patterns (regex, comma-separated):", font=ctk.CTkFont(weight="bold"))
+        self.ignore_label.pack(anchor="w", padx=10, pady=(10,5))
+
+        self.ignore_entry = ctk.CTkEntry(self.ignore_frame, placeholder_text="e.g., \\.tmp$, backup/.*")
+        self.ignore_entry.pack(fill="x", padx=10, pady=(0,10))
+
+        # Build button
+        self.build_btn = ctk.CTkButton(self, text="Build Plan", command=self.build_plan, fg_color="green", font=ctk.CTkFont(size=14, weight="bold"))
+        self.build_btn.pack(pady=10)
+
+        # Status
+        self.status_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=12, slant="italic"))
+        self.status_label.pack(pady=5)
+
+        # Plan Summary
+        self.summary_frame = ctk.CTkFrame(self)
+        self.summary_frame.pack(pady=10, padx=20, fill="x")
+        self.summary_frame.pack_forget()
+
+        self.summary_label = ctk.CTkLabel(self.summary_frame, text="Plan Summary:", font=ctk.CTkFont(weight="bold"))
+        self.summary_label.pack(anchor="w", padx=10, pady=(10,5))
+
+        self.summary_text = ctk.CTkLabel(self.summary_frame, text="", font=ctk.CTkFont(size=12))
+        self.summary_text.pack(anchor="w", padx=10, pady=(0,10))
+
+        # Table
+        self.table_label = ctk.CTkLabel(self, text="Plan Actions:", font=ctk.CTkFont(weight="bold"))
+        self.table_label.pack(anchor="w", padx=20, pady=(10,5))
+        self.table_label.pack_forget()
+
+        # Plain ttk container: the Treeview only draws visible rows, and a native
+        # scrollbar keeps scrolling cheap however long the plan is
+        self.tree_container = ttk.Frame(self)
+        self.tree = ttk.Treeview(self.tree_container, columns=("ID", "Type", "Src/SrcA", "Dest/SrcB"), show="headings", height=10)
+        self.tree.heading("ID", text="#")
+        self.tree.heading("Type", text="Type")
+        self.tree.heading("Src/SrcA", text="Src/SrcA")
+        self.tree.heading("Dest/SrcB", text="Dest/SrcB")
+        self.tree.column("ID", width=50)
+        self.tree.column("Type", width=120)
+        self.tree.column("Src/SrcA", width=250)
+        self.tree.column("Dest/SrcB", width=250)
+        self.tree_scrollbar = ttk.Scrollbar(self.tree_container, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.tree_scrollbar.set)
+        self.tree_scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree_container.pack(pady=5, padx=20, fill="both", expand=True)
+        self.tree_container.pack_forget()
+
+        # Apply section
+        self.apply_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.apply_frame.pack(pady=10, padx=20, fill="x")
+
+        self.dry_run_checkbox = ctk.CTkCheckBox(self.apply_frame, text="Dry run")
+        self.dry_run_checkbox.pack(side="left", padx=(0,20))
+
+        self.apply_btn = ctk.CTkButton(self.apply_frame, text="Apply Plan", command=self.apply_plan, fg_color="orange", font=ctk.CTkFont(size=14, weight="bold"))
+        self.apply_btn.pack(side="right")
+
+        self.apply_frame.pack_forget()
+
+        # Notes
+        self.notes_label = ctk.CTkLabel(self, text="Notes & Warnings:", font=ctk.CTkFont(weight="bold"))
+        self.notes_label.pack(anchor="w", padx=20, pady=(10,5))
+        self.notes_label.pack_forget()
+
+        self.notes_textbox = ctk.CTkTextbox(self, wrap="word", height=100)
+        self.notes_textbox.pack(pady=5, padx=20, fill="x")
+        self.notes_textbox.pack_forget()
+
+        self.plan = None
+        # True while a build or apply runs on the worker thread
+        self._busy = False
+        # Bumped on every table refresh to cancel stale chunked inserts
+        self._table_gen = 0
+
+    def add_source(self):
+        folder = filedialog.askdirectory(title="Select Source Vault Folder")
+        if folder:
+            # The dialog returns an absolute path; abspath only normalizes it, symlinks are kept as picked
+            source = Path(os.path.abspath(folder))
+            self.sources.append(source)
+            # Append just the new row; rebuilding the listbox would re-str() every source
+            self.source_listbox.insert(tk.END, str(source))
+
+    def remove_source(self):
+        selection = self.source_listbox.curselection()
+        if selection:
+            # One pass over the sources however many rows are selected
+            remove = set(selection)
+            self.sources = [s for i, s in enumerate(self.sources) if i not in remove]
+            self.update_source_list()
+
+    def update_source_list(self):
+        self.source_listbox.delete(0, tk.END)
+        for src in self.sources:
+            self.source_listbox.insert(tk.END, str(src))
+
+    def browse_target(self):
+        folder = filedialog.askdirectory(title="Select Target Vault Folder")
+        if folder:
+            self.target_entry.delete(0, tk.END)
+            self.target_entry.insert(0, folder)
+
+    def build_plan(self):
+        if self._busy:
+            return
+        target_text = self.target_entry.get()
+        if not self.sources:
+            self.status_label.configure(text="Please add at least one source vault.", text_color="red")
+            return
+        if not target_text:
+            self.status_label.configure(text="Please select a target vault path.", text_color="red")
+            return
+        target = Path(target_text)
+        ignore_text = self.ignore_entry.get()
+        ignore_patterns = _split_entries(ignore_text, _COMMA_SPLIT_RE)
+        # Scan on a worker thread so the window keeps repainting; results come back via after()
+        self._set_busy(True)
+        self.status_label.configure(text="Scanning vaults…", text_color="gray")
+        threading.Thread(target=self._do_build, args=(list(self.sources), target, ignore_patterns), daemon=True).start()
+
+    def _set_busy(self, busy):
+        # Grey out the buttons while a worker thread runs so clicks are not silently ignored
+        self._busy = busy
+        state = "disabled" if busy else "normal"
+        self.build_btn.configure(state=state)
+        self.apply_btn.configure(state=state)
+
+    def _do_build(self, sources, target, ignore_patterns):
+        try:
+            plan = build_plan(sources, target, ignore_patterns=ignore_patterns)
+            all_rows = _format_actions_by_type(plan)
+        except Exception as e:
+            self.after(0, self._on_build_failed, e)
+            return
+        self.after(0, self._on_build_done, plan, all_rows)
+
+    def _populate_table(self, rows):
+        self.tree.delete(*self.tree.get_children())
+        # A newer plan makes any chunks still queued for the old one stop
+        self._table_gen += 1
+        self._insert_rows(rows, 0, self._table_gen)
+
+    def _insert_rows(self, rows, start, gen):
+        if gen != self._table_gen:
+            return
+        end = start + _TABLE_CHUNK
+        # The row number doubles as item id, sparing Tk's auto-id allocation
+        for row in rows[start:end]:
+            self.tree.insert("", tk.END, iid=str(row[0]), values=row)
+        if end < len(rows):
+            # Tk repaints in idle callbacks, which a chain of after(0) timers would starve;
+            # wait for idle first so each chunk is drawn and input handled before the next
+            self.after_idle(self.after, 0, self._insert_rows, rows, end, gen)
+
+    def _on_build_failed(self, error):
+        self._set_busy(False)
+        self.status_label.configure(text=f"Error building plan: {error}", text_color="red")
+
+    def _on_build_done(self, plan, all_rows):
+        self._set_busy(False)
+        try:
+            self.plan = plan
+            
+            # Update summary
+            summary = _create_plan_summary(self.plan)
+            self.summary_text.configure(text=summary)
+            
+            # Update table; rows were formatted on the worker thread
+            self._populate_table(all_rows)
+            
+            # Show all plan-related elements
+            self.summary_frame.pack(pady=10, padx=20, fill="x")
+            self.table_label.pack(anchor="w", padx=20, pady=(10,5))
+            self.tree_container.pack(pady=5, padx=20, fill="both", expand=True)
+            self.apply_frame.pack(pady=10, padx=20, fill="x")
+            
+            # Update notes
+            notes = json.dumps({"notes": self.plan.get("notes", []), "warnings": self.plan.get("warnings", []), "excluded_files": self.plan.get("excluded_files", [])}, indent=2)
+            self.notes_textbox.delete("0.0", tk.END)
+            self.notes_textbox.insert("0.0", notes)
+            self.notes_label.pack(anchor="w", padx=20, pady=(10,5))
+            self.notes_textbox.pack(pady=5, padx=20, fill="x")
+            
+            self.status_label.configure(text="Plan built successfully", text_color="green")
+        except Exception as e:
+            self.status_label.configure(text=f"Error building plan: {e}", text_color="red")
+
+    def apply_plan(self):
+        if self.plan and not self._busy:
+            dry_run = self.dry_run_checkbox.get()
+            self._set_busy(True)
+            self.status_label.configure(text="Applying plan…", text_color="gray")
+            threading.Thread(target=self._do_apply, args=(self.plan, dry_run), daemon=True).start()
+
+    def _do_apply(self, plan, dry_run):
+        try:
+            apply_plan(plan, dry_run=dry_run)
+        except Exception as e:
+            self.after(0, self._on_apply_done, f"Error applying plan: {e}", "red")
+            return
+        status = "Success" + (" (dry run)" if dry_run else "")
+        self.after(0, self._on_apply_done, status, "green")
+
+    def _on_apply_done(self, status, color):
+        self._set_busy(False)
+        self.status_label.configure(text=status, text_color=color)
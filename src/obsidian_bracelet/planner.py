@@ -1,49 +1,187 @@
 from __future__ import annotations
 from pathlib import Path
+import functools
 import hashlib
+import os
 import re
-from collections import defaultdict
+import stat
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-def _sha256(p: Path) -> str:
-    try:
-        h = hashlib.sha256()
-        with p.open("rb") as f:
-            for chunk in iter(lambda: f.read(1 << 16), b""):
-                h.update(chunk)
+try:
+    # Hashes are only compared within one build_plan, so any collision-resistant hash will do
+    from blake3 import blake3 as _hasher
+except ImportError:  # blake3 ships with the "fast" extra; sha256 otherwise
+    _hasher = hashlib.sha256
+
+# Python 3.11+: reads into a reusable buffer and hashes without a per-chunk round trip
+_file_digest = getattr(hashlib, "file_digest", None)
+
+def _hash_file(p: str | Path) -> str:
+    # Raises OSError if the file can't be read; see _fallback_hash
+    with open(p, "rb") as f:
+        if _file_digest is not None:
+            return _file_digest(f, _hasher).hexdigest()
+        h = _hasher()
+        buf = memoryview(bytearray(1 << 20))
+        while n := f.readinto(buf):
+            h.update(buf[:n])
         return h.hexdigest()
-    except (OSError, PermissionError, IOError) as e:
-        # Return a hash based on filename and size if file can't be read
+
+def _fallback_hash(p: str | Path, st: os.stat_result | None = None) -> str:
+    # Return a hash based on filename and size if file can't be read
+    name = os.path.basename(p)
+    if st is None:
         try:
-            stat_info = p.stat()
-            return hashlib.sha256(f"{p.name}_{stat_info.st_size}".encode()).hexdigest()
-        except (OSError, PermissionError, IOError):
+            st = os.stat(p)
+        except OSError:
             # Fallback to filename only
-            return hashlib.sha256(p.name.encode()).hexdigest()
+            return _hasher(name.encode()).hexdigest()
+    return _hasher(f"{name}_{st.st_size}".encode()).hexdigest()
+
+@functools.lru_cache(maxsize=65536)
+def _cached_hash(path_str: str, size: int, mtime_ns: int) -> str:
+    # size and mtime_ns are part of the key so a modified file is hashed again;
+    # repeated plan builds (GUI) skip unchanged files. Read errors raise, so only
+    # real digests are cached and a transient failure is retried on the next build
+    return _hash_file(path_str)
+
+def _content_hash(p: str | Path, st: os.stat_result | None = None) -> str:
+    # st: the caller's stat of p, if it has one
+    try:
+        if st is None:
+            st = os.stat(p)
+        return _cached_hash(os.fspath(p), st.st_size, st.st_mtime_ns)
+    except OSError:
+        return _fallback_hash(p, st)
+
+# Thread pool size for file I/O here and in apply.py: hashlib and file syscalls
+# release the GIL, so reads, hashes and copies overlap across files
+_IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def _scan_dir(prefix: str, dir_path: str) -> tuple[list[str], list[tuple[str, str]]]:
+    # One directory's files (relative, "/"-separated) and the subdirectories to visit next
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(dir_path) as it:
+            # Only .obsidian/ holds ephemeral workspace state; checked per directory, not per file
+            in_settings = prefix == ".obsidian/"
+            for entry in it:
+                if in_settings and entry.name.startswith("workspace"):
+                    continue  # workspace files, and whole workspace* subtrees
+                rel = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((rel + "/", entry.path))
+                    continue
+                if entry.is_dir():
+                    continue  # symlinked directory: listed but not descended, like rglob
+                files.append(rel)
+    except OSError:
+        pass  # unreadable directory
+    return files, subdirs
+
+_WALK_WORKERS = 8
 
 def _rel_files(vault: Path):
-    # All files except .obsidian/workspace.json (ephemeral)
-    for p in vault.rglob("*"):
-        if p.is_dir():
-            continue
-        rel = p.relative_to(vault)
-        if str(rel).startswith(".obsidian/workspace"):
-            continue
-        yield rel
+    # All files except .obsidian/workspace.json (ephemeral), as relative path strings
+    # Walks with os.scandir so no Path is built for directories or skipped entries;
+    # each directory level is listed on a thread pool since scandir releases the GIL
+    pending = [("", os.fspath(vault))]
+    with ThreadPoolExecutor(max_workers=_WALK_WORKERS) as executor:
+        while pending:
+            if len(pending) == 1:
+                results = [_scan_dir(*pending[0])]
+            else:
+                results = executor.map(lambda d: _scan_dir(*d), pending)
+            pending = []
+            for files, subdirs in results:
+                if os.sep == "/":
+                    yield from files
+                else:
+                    for rel in files:
+                        yield rel.replace("/", os.sep)
+                pending.extend(subdirs)
+
+# Linked files with these extensions stay in place; anything else is moved under !res.
+# apply.py rewrites links with the same two helpers so both sides agree on the layout
+_TEXT_EXTS = frozenset(('.md', '.txt'))
+
+def _suffix(name: str) -> str:
+    # Lowercased Path(name).suffix, computed on the string
+    base = name[name.rfind('/') + 1:]
+    dot = base.rfind('.')
+    if dot <= 0 or dot == len(base) - 1:
+        return ''
+    return base[dot:].lower()
+
+def _ignore_matcher(patterns: list[str | re.Pattern]):
+    # One search over an alternation of all patterns instead of a Python loop per file
+    if not patterns:
+        return None
+    compiled = [re.compile(p) for p in patterns]
+    # Flags, whether passed to compile or inline like (?i), would apply to every pattern once joined
+    # (Python 3.10 accepts a mid-pattern (?i) with only a warning)
+    if all(p.flags == re.UNICODE for p in compiled):
+        sources = [p.pattern for p in compiled]
+        # Numbered backreferences would point at the wrong group once patterns are joined
+        if not any(re.search(r"\\[1-9]", p) for p in sources):
+            try:
+                return re.compile("|".join(f"(?:{p})" for p in sources)).search
+            except re.error:
+                pass  # e.g. the same group name in two patterns
+    return lambda rel: any(p.search(rel) for p in compiled)
+
+# Wiki links [[link]] and markdown links [text](link) in one scan, matched on raw bytes
+_LINK_RE = re.compile(rb'\[\[([^\]]+)\]\]|\[([^\]]+)\]\(([^)]+)\)')
 
-def _extract_links(content: str) -> set[str]:
+def _collect_links(data: bytes, links: set[str]):
+    # Only the matched groups are decoded, never the whole note
+    for match in _LINK_RE.finditer(data):
+        wiki = match.group(1)
+        if wiki is not None:
+            links.add(wiki.decode("utf-8", "ignore").split('|')[0].strip())  # handle aliases
+        else:
+            link = match.group(3).decode("utf-8", "ignore").strip()
+            if not link.startswith(('http://', 'https://', '#')):  # relative links
+                links.add(link)
+
+@functools.lru_cache(maxsize=65536)
+def _scan_note(path_str: str, size: int, mtime_ns: int) -> tuple[str, frozenset[str]]:
+    # Cached like _cached_hash; the links are frozen since the result is shared between builds
+    # Read, not mmap: a note truncated while Obsidian saves it would raise SIGBUS on a mapping
     links = set()
-    # Wiki links [[link]]
-    for match in re.finditer(r'\[\[([^\]]+)\]\]', content):
-        link = match.group(1).split('|')[0].strip()  # handle aliases
-        links.add(link)
-    # Markdown links [text](link)
-    for match in re.finditer(r'\[([^\]]+)\]\(([^)]+)\)', content):
-        link = match.group(2).strip()
-        if not link.startswith(('http://', 'https://', '#')):  # relative links
-            links.add(link)
-    return links
-
-def build_plan(sources: list[Path], target: Path, ignore_patterns: list[str] = None) -> dict:
+    with open(path_str, "rb") as f:
+        data = f.read()
+    _collect_links(data, links)
+    return _hasher(data).hexdigest(), frozenset(links)
+
+def _scan_file(path: str, is_md: bool) -> tuple[str | None, frozenset[str] | None, os.stat_result | None]:
+    # (hash, links, stat). Other files are only stat'ed here; build_plan hashes them if the size is shared.
+    # Notes are read once: the same bytes feed the hash and the link scan.
+    # stat is None unless path is a regular file
+    try:
+        st = os.stat(path)
+    except OSError:
+        return _fallback_hash(path), None, None
+    if not stat.S_ISREG(st.st_mode):
+        return _content_hash(path, st), None, None  # special file: hashed directly, never size-keyed
+    if not is_md:
+        return None, None, st
+    try:
+        h, links = _scan_note(path, st.st_size, st.st_mtime_ns)
+    except OSError:
+        return _fallback_hash(path, st), None, None  # unreadable
+    return h, links, st
+
+def _try_scan_file(path: str, is_md: bool) -> tuple[str | None, frozenset[str] | None, os.stat_result | None] | Exception:
+    # For executor.map: hand back the error instead of raising so one file does not abort the rest
+    try:
+        return _scan_file(path, is_md)
+    except Exception as e:
+        return e
+
+def build_plan(sources: list[Path], target: Path, ignore_patterns: list[str | re.Pattern] = None) -> dict:
     if ignore_patterns is None:
         ignore_patterns = []
     assert sources, "At least one source vault required"
@@ -52,36 +190,75 @@ def build_plan(sources: list[Path], target: Path, ignore_patterns: list[str] = N
     warnings = []
     excluded = []
 
+    ignored = _ignore_matcher(ignore_patterns)
+
     # Map relpath -> list of (vault_name, abs_path, hash)
     index = defaultdict(list)
-    for s in sources:
-        if not (s / ".obsidian").exists():
-            warnings.append(f"{s} does not look like an Obsidian vault (missing .obsidian)")
-        vname = s.name
-        for rel in _rel_files(s):
-            skip = False
-            for pattern in ignore_patterns:
-                if re.search(pattern, str(rel)):
-                    excluded.append(f"{vname}:{str(rel)}")
-                    skip = True
-                    break
-            if skip:
-                continue
-            ap = s / rel
-            try:
-                index[str(rel)].append((vname, ap, _sha256(ap)))
-            except Exception as e:
-                warnings.append(f"Skipping {vname}:{str(rel)} due to error: {e}")
-                continue
+    # Links found in each markdown entry
+    note_links = []
+    # abs_path -> stat of each regular file, and the entries keyed by size rather than content hash
+    stats = {}
+    size_keyed = []
+    with ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor, \
+            ThreadPoolExecutor(max_workers=len(sources)) as walkers:
+        # All vaults are walked at once; each one is hashed as soon as its walk finishes
+        walks = walkers.map(lambda s: list(_rel_files(s)), sources)
+        for s, rels in zip(sources, walks):
+            if not (s / ".obsidian").exists():
+                warnings.append(f"{s} does not look like an Obsidian vault (missing .obsidian)")
+            vname = s.name
+            # Paths stay strings here; a vault can hold many thousands of files
+            vault_str = str(s)
+            files = []
+            for rel in rels:
+                if ignored is not None and ignored(rel):
+                    excluded.append(f"{vname}:{rel}")
+                    continue
+                files.append((rel, os.path.join(vault_str, rel)))
+            # Hash the whole vault on the pool, scanning notes for links in the same read;
+            # map keeps the walk order
+            paths = [ap for _, ap in files]
+            is_md = [rel.lower().endswith(".md") for rel, _ in files]
+            for (rel, ap), result in zip(files, executor.map(_try_scan_file, paths, is_md)):
+                if isinstance(result, Exception):
+                    warnings.append(f"Skipping {vname}:{rel} due to error: {result}")
+                    continue
+                h, links, st = result
+                index[rel].append((vname, ap, h))
+                if st is not None:
+                    stats[ap] = st
+                if links is not None:
+                    # Resolved once planned_files is complete
+                    note_links.append(links)
+
+        # A file whose size no other file has cannot be a duplicate: key it by size instead of reading it
+        size_counts = Counter(st.st_size for st in stats.values())
+        to_hash = [ap for entries in index.values() for _, ap, h in entries if h is None and size_counts[stats[ap].st_size] > 1]
+        hashed = dict(zip(to_hash, executor.map(_content_hash, to_hash, [stats[ap] for ap in to_hash])))
+        for entries in index.values():
+            for i, (vname, ap, h) in enumerate(entries):
+                if h is None:
+                    if ap in hashed:
+                        h = hashed[ap]
+                    else:
+                        h = f"size:{stats[ap].st_size}"
+                        size_keyed.append(ap)
+                    entries[i] = (vname, ap, h)
 
+    target_str = str(target)
+    # Every destination is joined onto target_str, so slicing this off gives its target-relative path
+    target_prefix = os.path.join(target_str, "")
     # Ensure base target dir creation
     actions.append({"type": "mkdir", "path": "."})
 
+    # Target-relative paths that will exist after apply
+    planned_files = set()
     for rel, entries in index.items():
         # Unique file: copy as-is
         if len(entries) == 1:
             vname, ap, _h = entries[0]
-            actions.append({"type": "copy", "src": str(ap), "dest": str(Path(target) / rel)})
+            actions.append({"type": "copy", "src": ap, "dest": os.path.join(target_str, rel)})
+            planned_files.add(rel)
             continue
 
         # Multiple entries with same rel
@@ -90,81 +267,104 @@ def build_plan(sources: list[Path], target: Path, ignore_patterns: list[str] = N
             # identical content: keep first
             vname, ap, _h = entries[0]
             notes.append(f"Deduplicated identical {rel} from {len(entries)} vaults; kept {vname}")
-            actions.append({"type": "copy", "src": str(ap), "dest": str(Path(target) / rel)})
+            actions.append({"type": "copy", "src": ap, "dest": os.path.join(target_str, rel)})
+            planned_files.add(rel)
             continue
 
         # Different content: collision
         suffix_copies = []
-        is_md = str(rel).lower().endswith(".md")
+        is_md = rel.lower().endswith(".md")
         if is_md and len(entries) == 2:
             # propose merge_markdown
             (v1, ap1, _), (v2, ap2, _) = entries
-            dest = Path(target) / rel
-            actions.append({"type": "merge_markdown", "src_a": str(ap1), "src_b": str(ap2), "dest": str(dest), "vault_a": v1, "vault_b": v2})
+            dest = os.path.join(target_str, rel)
+            actions.append({"type": "merge_markdown", "src_a": ap1, "src_b": ap2, "dest": dest, "vault_a": v1, "vault_b": v2})
+            planned_files.add(rel)
             notes.append(f"Proposed merge for markdown collision: {rel} ({v1} vs {v2})")
         else:
             # rename copies with vault suffix
+            # Split like Path.stem/.suffix, on the string
+            head, name = os.path.split(rel)
+            dot = name.rfind('.')
+            if 0 < dot < len(name) - 1:
+                stem, ext = name[:dot], name[dot:]
+            else:
+                stem, ext = name, ''
             for vname, ap, _ in entries:
-                stem = Path(rel).stem
-                ext = Path(rel).suffix
-                renamed = Path(rel).with_name(f"{stem}__vault-{vname}{ext}")
-                dest = Path(target) / renamed
-                suffix_copies.append({"type": "rename_copy", "src": str(ap), "dest": str(dest)})
+                renamed = os.path.join(head, f"{stem}__vault-{vname}{ext}")
+                suffix_copies.append({"type": "rename_copy", "src": ap, "dest": os.path.join(target_str, renamed)})
+                planned_files.add(renamed)
             actions.extend(suffix_copies)
             warnings.append(f"Collision on {rel}: proposing {len(suffix_copies)} renamed copies")
 
     # Collect linked files to copy
-    planned_files = {Path(act["dest"]).relative_to(target) for act in actions if "dest" in act and act["type"] in ("copy", "rename_copy", "merge_markdown")}
-    for act in actions:
-        if act["type"] == "merge_markdown":
-            planned_files.add(Path(act["dest"]).relative_to(target))
-
     linked_to_copy = set()
-    for rel, entries in index.items():
-        if not str(rel).lower().endswith(".md"):
-            continue
-        for vname, ap, _ in entries:
-            try:
-                content = ap.read_text(encoding="utf-8", errors="ignore")
-                links = _extract_links(content)
-                for link in links:
-                    link_path = Path(link)
-                    if link_path.suffix:  # has extension, assume file
-                        # Find if exists in any vault
-                        for s in sources:
-                            full_link = s / link_path
-                            if full_link.exists() and full_link.is_file():
-                                if link_path.suffix.lower() in ('.md', '.txt'):
-                                    rel_link = link_path
-                                else:
-                                    rel_link = Path("!res") / link_path
-                                if rel_link not in planned_files:
-                                    linked_to_copy.add((str(full_link), str(Path(target) / rel_link)))
-                                    planned_files.add(rel_link)
-                                break
-            except Exception:
-                pass  # ignore read errors
-
-    linked_res_files = {Path(dest).name for src, dest in linked_to_copy if '!res' in dest}
+    # Indexed files with a size were stat'ed as regular files; only other candidates
+    # (ignored files, broken symlinks, special files, broken links) need an isfile check
+    indexed_paths = stats.keys()
+    source_strs = [str(s) for s in sources]
+    # Many notes link the same file; each distinct link is resolved once
+    seen_links = set()
+    for links in note_links:
+        for link in links:
+            if link in seen_links:
+                continue
+            seen_links.add(link)
+            ext = _suffix(link)
+            if ext:  # has extension, assume file
+                link_str = str(Path(link))
+                # Find if exists in any vault
+                for s_str in source_strs:
+                    full_link = os.path.join(s_str, link_str)
+                    if full_link in indexed_paths or os.path.isfile(full_link):
+                        if ext in _TEXT_EXTS:
+                            rel_link = link_str
+                        else:
+                            rel_link = os.path.join("!res", link_str)
+                        if rel_link not in planned_files:
+                            linked_to_copy.add((full_link, os.path.join(target_str, rel_link)))
+                            planned_files.add(rel_link)
+                        break
+
+    linked_res_files = {os.path.basename(dest) for src, dest in linked_to_copy if '!res' in dest}
     # Remove root copies of files moved to !res
-    actions = [act for act in actions if not (act.get("type") == "copy" and Path(act["dest"]).name in linked_res_files)]
+    actions = [act for act in actions if not (act.get("type") == "copy" and os.path.basename(act["dest"]) in linked_res_files)]
     for src, dest in linked_to_copy:
         actions.append({"type": "copy", "src": src, "dest": dest})
 
     # Basic .obsidian settings merge placeholders
-    actions.append({"type": "merge_settings", "sources": [str(s) for s in sources], "dest": str(Path(target) / ".obsidian")})
+    actions.append({"type": "merge_settings", "sources": [str(s) for s in sources], "dest": os.path.join(target_str, ".obsidian")})
 
     # Deduplicate same content across different names
-    dest_hashes = {}
-    for act in actions:
-        if act["type"] == "copy":
-            h = _sha256(Path(act["src"]))
-            dest_hashes[act["dest"]] = h
+    copies = [act for act in actions if act["type"] == "copy"]
+    # Indexed sources were hashed above; only linked files found outside the index need reading
+    src_hashes = {ap: h for entries in index.values() for _, ap, h in entries}
+    unhashed = list({act["src"] for act in copies if act["src"] not in src_hashes})
+    if unhashed:
+        # Size-keyed entries need a real hash once an outside file of the same size turns up
+        unhashed_stats = []
+        for src in unhashed:
+            try:
+                unhashed_stats.append(os.stat(src))
+            except OSError:
+                unhashed_stats.append(None)  # _content_hash falls back to a name hash
+        extra_sizes = {st.st_size for st in unhashed_stats if st is not None}
+        rehash = [ap for ap in size_keyed if stats[ap].st_size in extra_sizes]
+        unhashed += rehash
+        unhashed_stats += [stats[ap] for ap in rehash]
+        with ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor:
+            src_hashes.update(zip(unhashed, executor.map(_content_hash, unhashed, unhashed_stats)))
+    dest_hashes = {act["dest"]: src_hashes[act["src"]] for act in copies}
 
     hash_to_dests = defaultdict(list)
     for dest, h in dest_hashes.items():
         hash_to_dests[h].append(dest)
 
+    # First copy action per destination, so duplicates are found without rescanning actions
+    dest_to_action = {}
+    for act in copies:
+        dest_to_action.setdefault(act["dest"], act)
+
     replaced_files = {}  # old_path -> new_path
     for h, dests in hash_to_dests.items():
         if len(dests) > 1:
@@ -172,39 +372,39 @@ def build_plan(sources: list[Path], target: Path, ignore_patterns: list[str] = N
             kept = dests[0]
             for d in dests[1:]:
                 replaced_files[d] = kept
-                for act in actions:
-                    if act.get("dest") == d and act["type"] == "copy":
-                        act["type"] = "create_link_file"
-                        act["link_to"] = kept
-                        del act["src"]
-                        rel_d = Path(d).relative_to(target)
-                        rel_kept = Path(kept).relative_to(target)
-                        notes.append(f"Deduplicated same content: {rel_d} -> {rel_kept}")
-                        break
+                act = dest_to_action[d]
+                act["type"] = "create_link_file"
+                act["link_to"] = kept
+                del act["src"]
+                rel_d = d[len(target_prefix):]
+                rel_kept = kept[len(target_prefix):]
+                notes.append(f"Deduplicated same content: {rel_d} -> {rel_kept}")
 
     # Update links that point to replaced files
     if replaced_files:
+        # Wiki links [[old_rel]] or markdown links [text](old_rel), probed in one scan per file
+        probe_to_old = {}
+        for old_path in replaced_files:
+            old_rel = old_path[len(target_prefix):]
+            probe_to_old[f"[[{old_rel}]]"] = old_path
+            probe_to_old[f"]({old_rel})"] = old_path
+        old_links_re = re.compile("|".join(re.escape(p) for p in probe_to_old))
         # Find all actions that copy files that might contain links
         for act in actions:
             if act["type"] in ("copy", "merge_markdown") and act.get("dest", "").endswith(".md"):
                 src_path = act.get("src")
-                if src_path and Path(src_path).exists():
+                if src_path:
+                    # A missing source fails the open like any other unreadable file; no separate exists() stat
                     try:
-                        content = Path(src_path).read_text(encoding="utf-8", errors="ignore")
-                        needs_update = False
-                        for old_path, new_path in replaced_files.items():
-                            old_rel = Path(old_path).relative_to(target)
-                            new_rel = Path(new_path).relative_to(target)
-                            # Check for wiki links [[old_rel]] or markdown links [text](old_rel)
-                            if f"[[{old_rel}]]" in content or f"]({old_rel})" in content:
-                                needs_update = True
-                                break
-                        if needs_update:
-                            # Add an update_links action for this file
+                        with open(src_path, encoding="utf-8", errors="ignore") as f:
+                            content = f.read()
+                        hits = {probe_to_old[m.group(0)] for m in old_links_re.finditer(content)}
+                        if hits:
+                            # Add an update_links action for this file, carrying only the links it uses
                             actions.append({
                                 "type": "update_file_links",
                                 "file": act["dest"],
-                                "link_updates": {old_path: new_path for old_path, new_path in replaced_files.items()}
+                                "link_updates": {old: replaced_files[old] for old in sorted(hits)}
                             })
                     except Exception:
                         pass  # Skip files that can't be read
@@ -3,6 +3,12 @@ Test Case Mapping for tests/test_apply.py:
 
 - test_apply_basic_merge: Corresponds to Test Case 1 in test-vaults/Test Cases.md (Basic Vault Merging)
 - test_apply_daily_notes_merge: Corresponds to Test Case 4 in test-vaults/Test Cases.md (Daily Notes Merging)
+- test_apply_update_file_links: Link updates rewrite only the mapped wiki and markdown links
+- test_apply_hardlink_assets: hardlink_assets links attachments but copies notes
+- test_apply_preserves_crlf_line_endings: Rewritten notes keep CRLF line endings
+- test_apply_plan_runs_are_independent: Each apply_plan run creates its directories afresh
+- test_apply_same_named_vaults_last_copy_wins: Copies sharing a destination run in plan order
+- test_apply_copy_then_update_links_same_note: A copy and a link update of one note in one run
 """
 
 import json
@@ -149,4 +155,133 @@ def test_apply_daily_notes_merge(daily_notes_setup):
     assert (target / "Work Note.md").exists()
     
     # Verify .obsidian directory
-    assert (target / ".obsidian").exists()
\ No newline at end of file
+    assert (target / ".obsidian").exists()
+
+def test_apply_update_file_links(tmp_path: Path):
+    """update_file_links rewrites wiki and markdown links to deduplicated files"""
+    target = tmp_path / "merged"
+    target.mkdir()
+    note = target / "Main.md"
+    note.write_text("See [[Ideas.md]] and [ideas](Ideas.md).\nKeep [[Other.md]].")
+    plan = {
+        "target_root": str(target),
+        "actions": [
+            {
+                "type": "update_file_links",
+                "file": str(note),
+                "link_updates": {str(target / "Ideas.md"): str(target / "Concepts.md")},
+            }
+        ],
+    }
+
+    apply_plan(plan)
+
+    content = note.read_text()
+    assert content == "See [[Concepts.md]] and [ideas](Concepts.md).\nKeep [[Other.md]]."
+
+
+def test_apply_hardlink_assets(tmp_path: Path):
+    """hardlink_assets links attachments into the target but still copies notes"""
+    vault = tmp_path / "vault"
+    (vault / ".obsidian").mkdir(parents=True)
+    (vault / "image.png").write_bytes(b"\x89PNG data")
+    (vault / "Note.md").write_text("# Note")
+    target = tmp_path / "merged"
+
+    plan = build_plan([vault], target)
+    plan["hardlink_assets"] = True
+    apply_plan(plan)
+    # Re-applying over existing links must leave the sources intact
+    apply_plan(plan)
+
+    assert (target / "image.png").stat().st_ino == (vault / "image.png").stat().st_ino
+    assert (vault / "image.png").read_bytes() == b"\x89PNG data"
+    assert (target / "Note.md").stat().st_ino != (vault / "Note.md").stat().st_ino
+    assert (target / "Note.md").read_text() == "# Note"
+
+
+def test_apply_preserves_crlf_line_endings(tmp_path: Path):
+    """Notes whose links are rewritten keep their CRLF line endings byte for byte"""
+    vault = tmp_path / "vault"
+    (vault / ".obsidian").mkdir(parents=True)
+    (vault / "pic.png").write_bytes(b"\x89PNG data")
+    (vault / "Note.md").write_bytes(b"line one\r\n![[pic.png]]\r\n")
+    target = tmp_path / "merged"
+
+    apply_plan(build_plan([vault], target))
+    assert (target / "Note.md").read_bytes() == b"line one\r\n![[!res/pic.png]]\r\n"
+
+    # update_file_links reading the note from disk
+    (target / "Main.md").write_bytes(b"See [[Ideas.md]].\r\nEnd\r\n")
+    apply_plan({
+        "target_root": str(target),
+        "actions": [
+            {
+                "type": "update_file_links",
+                "file": str(target / "Main.md"),
+                "link_updates": {str(target / "Ideas.md"): str(target / "Concepts.md")},
+            }
+        ],
+    })
+    assert (target / "Main.md").read_bytes() == b"See [[Concepts.md]].\r\nEnd\r\n"
+
+
+def test_apply_plan_runs_are_independent(tmp_path: Path):
+    """A second run recreates directories even after the first run's target is removed"""
+    vault = tmp_path / "vault"
+    (vault / ".obsidian").mkdir(parents=True)
+    (vault / "sub" / "deep").mkdir(parents=True)
+    (vault / "sub" / "deep" / "Note.md").write_text("# Note")
+    target = tmp_path / "merged"
+
+    plan = build_plan([vault], target)
+    apply_plan(plan)
+    shutil.rmtree(target)
+    apply_plan(plan)
+
+    assert (target / "sub" / "deep" / "Note.md").read_text() == "# Note"
+
+
+def test_apply_same_named_vaults_last_copy_wins(tmp_path: Path):
+    """Copies that share a destination run in plan order, so the last one wins intact"""
+    vault_x = tmp_path / "x" / "notes"
+    vault_y = tmp_path / "y" / "notes"
+    for vault in (vault_x, vault_y):
+        (vault / ".obsidian").mkdir(parents=True)
+    for i in range(20):
+        (vault_x / f"a{i}.png").write_bytes(b"A" * 100_000)
+        (vault_y / f"a{i}.png").write_bytes(b"B" * 10)
+    target = tmp_path / "merged"
+
+    plan = build_plan([vault_x, vault_y], target)
+    dests = [act["dest"] for act in plan["actions"] if act["type"] == "rename_copy"]
+    assert len(dests) == 40 and len(set(dests)) == 20
+    apply_plan(plan)
+
+    for dest in set(dests):
+        assert Path(dest).read_bytes() == b"B" * 10
+
+
+def test_apply_copy_then_update_links_same_note(tmp_path: Path):
+    """update_file_links on a note copied in the same run starts from the copied text"""
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    (vault / "Note.md").write_text("![[pic.png]] see [[Ideas.md]] and [more](Ideas.md)")
+    target = tmp_path / "merged"
+    note = target / "Note.md"
+
+    apply_plan({
+        "target_root": str(target),
+        "actions": [
+            {"type": "mkdir", "path": "."},
+            {"type": "copy", "src": str(vault / "Note.md"), "dest": str(note)},
+            {
+                "type": "update_file_links",
+                "file": str(note),
+                "link_updates": {str(target / "Ideas.md"): str(target / "Concepts.md")},
+            },
+        ],
+    })
+
+    # Both the copy's !res rewrite and the link update end up in the file
+    assert note.read_text() == "![[!res/pic.png]] see [[Concepts.md]] and [more](Concepts.md)"
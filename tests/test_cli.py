@@ -0,0 +1,53 @@
+"""
+Test Case Mapping for tests/test_cli.py:
+
+- test_plan_file_round_trips_through_apply: Plans written by `plan` (orjson or json) load in `apply`
+- test_invalid_ignore_regex_is_usage_error: Bad --ignore patterns are reported as usage errors
+"""
+
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from obsidian_bracelet import cli
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def vault(tmp_path: Path):
+    vault = tmp_path / "vault"
+    (vault / ".obsidian").mkdir(parents=True)
+    (vault / "Note.md").write_text("# Notiz über [[pic.png]]", encoding="utf-8")
+    (vault / "pic.png").write_bytes(b"\x89PNG data")
+    return vault
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_plan_file_round_trips_through_apply(vault: Path, tmp_path: Path, monkeypatch, use_orjson: bool):
+    """A plan written with orjson or plain json applies the same way"""
+    if use_orjson:
+        monkeypatch.setattr(cli, "orjson", pytest.importorskip("orjson"))
+    else:
+        monkeypatch.setattr(cli, "orjson", None)
+    target = tmp_path / "merged"
+    plan_file = tmp_path / "plan.json"
+
+    result = runner.invoke(cli.app, ["plan", "-s", str(vault), "-t", str(target), "-o", str(plan_file)])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(cli.app, ["apply", str(plan_file)])
+    assert result.exit_code == 0, result.output
+
+    assert (target / "Note.md").read_text(encoding="utf-8") == "# Notiz über [[!res/pic.png]]"
+    assert (target / "!res" / "pic.png").read_bytes() == b"\x89PNG data"
+
+
+def test_invalid_ignore_regex_is_usage_error(vault: Path, tmp_path: Path):
+    """An invalid --ignore regex exits with a usage error instead of a traceback"""
+    result = runner.invoke(cli.app, ["plan", "-s", str(vault), "-t", str(tmp_path / "merged"),
+                                     "-o", str(tmp_path / "plan.json"), "-i", "notes/("])
+    assert result.exit_code == 2
+    assert isinstance(result.exception, SystemExit)
+    assert "--ignore" in result.output
+    assert not (tmp_path / "plan.json").exists()
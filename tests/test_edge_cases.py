@@ -5,6 +5,7 @@ Test Case Mapping for tests/test_edge_cases.py:
 - test_invalid_vault: Corresponds to Test Case 7, Scenario 2 (Invalid vault)
 - test_permission_errors: Corresponds to Test Case 7, Scenario 3 (Permission errors)
 - test_large_files: Corresponds to Test Case 7, Scenario 4 (Large files)
+- test_transient_read_error_not_cached: A failed read is retried by the next build, not cached
 """
 
 import json
@@ -14,6 +15,7 @@ from pathlib import Path
 import pytest
 import tempfile
 
+from obsidian_bracelet import planner
 from obsidian_bracelet.planner import build_plan
 from obsidian_bracelet.apply import apply_plan
 
@@ -168,4 +170,20 @@ def test_large_files_merge(tmp_path: Path):
     assert "Content from vault 1" in merged_content
     assert "Content from vault 2" in merged_content
     assert "---" in merged_content  # Divider should be present
-    assert len(merged_content) > 1000 * 1024  # Should be larger than 1MB total
\ No newline at end of file
+    assert len(merged_content) > 1000 * 1024  # Should be larger than 1MB total
+
+
+def test_transient_read_error_not_cached(tmp_path: Path, monkeypatch):
+    """A file that could not be read once is hashed by content on the next attempt"""
+    f = tmp_path / "image.png"
+    f.write_bytes(b"\x89PNG data")
+
+    def unreadable(p):
+        raise PermissionError(13, "Permission denied", str(p))
+
+    real_hash_file = planner._hash_file
+    monkeypatch.setattr(planner, "_hash_file", unreadable)
+    fallback = planner._content_hash(str(f))
+    monkeypatch.setattr(planner, "_hash_file", real_hash_file)
+
+    assert planner._content_hash(str(f)) == real_hash_file(str(f)) != fallback
@@ -4,6 +4,7 @@ Test Case Mapping for tests/test_gui.py:
 - test_format_actions_groups_markdown_and_rename: General GUI functionality test
 - test_build_plan_action_validates_inputs: GUI input validation test
 - test_build_plan_action_success: Corresponds to Test Case 1 in test-vaults/Test Cases.md (Basic Vault Merging)
+- test_build_plan_action_resolves_sources / test_build_plan_action_reports_symlink_loop: source path resolution
 """
 
 import json
@@ -159,3 +160,27 @@ def test_gui_review_process_test_case_5(tmp_path: Path):
     
     # This test verifies GUI can handle the same plan that would be used in Test Case 5
     # The actual GUI display testing would require a desktop environment
+
+
+
+def test_build_plan_action_resolves_sources(tmp_path: Path, monkeypatch):
+    """Sources given through a symlink, "~" or a relative path are resolved like Path.resolve()"""
+    real = tmp_path / "real" / "vault"
+    (real / ".obsidian").mkdir(parents=True)
+    (real / "Note.md").write_text("A")
+    (tmp_path / "link").symlink_to(tmp_path / "real", target_is_directory=True)
+    monkeypatch.setenv("HOME", str(tmp_path / "link"))
+    monkeypatch.chdir(tmp_path)
+
+    for entry in (str(tmp_path / "link" / "vault"), "~/vault", "link/../real/vault"):
+        plan_json, *_, status, _, _, _, _ = build_plan_action(entry, str(tmp_path / "merged"))
+        assert status == ""
+        assert json.loads(plan_json)["sources"] == [str(real.resolve())]
+
+
+def test_build_plan_action_reports_symlink_loop(tmp_path: Path):
+    """A symlink loop in a source path is reported in the status instead of raising"""
+    (tmp_path / "loop").symlink_to(tmp_path / "loop")
+    result = build_plan_action(str(tmp_path / "loop" / "vault"), str(tmp_path / "merged"))
+    assert result[0] == ""
+    assert result[3]
@@ -9,13 +9,18 @@ Core Functionality Tests:
 New Feature Tests:
 - test_same_content_different_names_deduplication: Corresponds to Test Case 8 in test-vaults/Test Cases.md
 - test_ignore_patterns: Corresponds to Test Case 9 in test-vaults/Test Cases.md
+- test_link_updates_only_used_links: Link update actions carry only the replacements a note uses
+- test_same_size_assets_deduplicated: Non-markdown files are hashed only when their sizes match
+- test_ignore_patterns_keep_their_own_flags: Inline flags in one ignore pattern do not leak into others
+- test_broken_symlink_link_not_moved_to_res: Links only move regular files under !res
+- test_rel_files_matches_rglob_walk: The vault walk lists the same files as the original rglob walk
 """
 
 import json
 from pathlib import Path
 import pytest
 
-from obsidian_bracelet.planner import build_plan
+from obsidian_bracelet.planner import _rel_files, build_plan
 
 
 # Test Case 2: Content-Based Deduplication (Same Names)
@@ -200,4 +205,111 @@ def test_ignore_patterns(tmp_path: Path):
 
     # Should also have settings actions
     settings_actions = [a for a in actions if a["type"] == "merge_settings"]
-    assert len(settings_actions) == 1
\ No newline at end of file
+    assert len(settings_actions) == 1
+
+
+def test_link_updates_only_used_links(tmp_path: Path):
+    """Each update_file_links action lists only the replaced files its note links to"""
+    v1 = tmp_path / "vault1"
+    v2 = tmp_path / "vault2"
+    target = tmp_path / "merged"
+    for v in (v1, v2):
+        (v / ".obsidian").mkdir(parents=True)
+        (v / ".obsidian" / "app.json").write_text("{}")
+    # Two pairs of same-content files; A2.md and B2.md become links to A.md and B.md
+    (v1 / "A.md").write_text("alpha")
+    (v1 / "B.md").write_text("beta")
+    (v2 / "A2.md").write_text("alpha")
+    (v2 / "B2.md").write_text("beta")
+    (v1 / "Note.md").write_text("See [[A2.md]].")
+
+    plan = build_plan([v1, v2], target)
+
+    updates = [a for a in plan["actions"] if a["type"] == "update_file_links"]
+    assert len(updates) == 1
+    assert updates[0]["file"] == str(target / "Note.md")
+    assert updates[0]["link_updates"] == {str(target / "A2.md"): str(target / "A.md")}
+
+
+def test_same_size_assets_deduplicated(tmp_path: Path):
+    """Assets sharing a size are compared by content; a uniquely sized one is copied as-is"""
+    v1 = tmp_path / "vault1"
+    v2 = tmp_path / "vault2"
+    target = tmp_path / "merged"
+    for v in (v1, v2):
+        (v / ".obsidian").mkdir(parents=True)
+        (v / ".obsidian" / "app.json").write_text("{}")
+    (v1 / "photo.png").write_bytes(b"\x89PNG same bytes")
+    (v2 / "picture.png").write_bytes(b"\x89PNG same bytes")
+    (v2 / "other.png").write_bytes(b"\x89PNG diff bytes")
+    (v2 / "large.png").write_bytes(b"\x89PNG" * 10)
+
+    plan = build_plan([v1, v2], target)
+    actions = plan["actions"]
+
+    links = [a for a in actions if a["type"] == "create_link_file"]
+    assert [(a["dest"], a["link_to"]) for a in links] == [(str(target / "picture.png"), str(target / "photo.png"))]
+    copy_dests = {a["dest"] for a in actions if a["type"] == "copy"}
+    assert {str(target / n) for n in ("photo.png", "other.png", "large.png")} <= copy_dests
+
+
+def test_ignore_patterns_keep_their_own_flags(tmp_path: Path):
+    """An inline (?i) applies only to its own ignore pattern, as with separate searches"""
+    vault = tmp_path / "vault"
+    (vault / ".obsidian").mkdir(parents=True)
+    for name in ("BACKUP.md", "Draft.md", "draft.md", "keep.md"):
+        (vault / name).write_text(name)
+
+    plan = build_plan([vault], tmp_path / "merged", ignore_patterns=["(?i)backup", "Draft"])
+
+    assert sorted(plan["excluded_files"]) == ["vault:BACKUP.md", "vault:Draft.md"]
+
+
+def test_broken_symlink_link_not_moved_to_res(tmp_path: Path):
+    """A linked attachment that is a dangling symlink is not treated as an existing file"""
+    vault = tmp_path / "vault"
+    (vault / ".obsidian").mkdir(parents=True)
+    (vault / "broken.png").symlink_to(tmp_path / "missing.png")
+    (vault / "ok.png").write_bytes(b"\x89PNG")
+    (vault / "Note.md").write_text("![[broken.png]] ![[ok.png]]")
+    target = tmp_path / "merged"
+
+    plan = build_plan([vault], target)
+    dests = {a["dest"] for a in plan["actions"] if a["type"] == "copy"}
+    assert str(target / "broken.png") in dests
+    assert str(target / "!res" / "broken.png") not in dests
+    assert str(target / "!res" / "ok.png") in dests
+
+
+def test_rel_files_matches_rglob_walk(tmp_path: Path):
+    """Workspace pruning and symlink handling match the original rglob-based walk"""
+    vault = tmp_path / "vault"
+    (vault / ".obsidian" / "workspaces" / "sub").mkdir(parents=True)
+    (vault / ".obsidian" / "app.json").write_text("{}")
+    (vault / ".obsidian" / "workspace.json").write_text("{}")
+    (vault / ".obsidian" / "workspace-mobile.json").write_text("{}")
+    (vault / ".obsidian" / "workspaces" / "sub" / "layout.json").write_text("{}")
+    (vault / "notes").mkdir()
+    (vault / "notes" / "workspace.json").write_text("{}")
+    (vault / "workspace.md").write_text("# Workspace")
+    outside = tmp_path / "outside"
+    (outside / "inner").mkdir(parents=True)
+    (outside / "top.md").write_text("# Top")
+    (outside / "inner" / "deep.md").write_text("# Deep")
+    (vault / "linked").symlink_to(outside, target_is_directory=True)
+
+    # The walk before it moved to os.scandir
+    expected = sorted(
+        str(p.relative_to(vault)) for p in vault.rglob("*")
+        if not p.is_dir() and not str(p.relative_to(vault)).startswith(".obsidian/workspace")
+    )
+    actual = sorted(_rel_files(vault))
+    assert actual == expected
+    # workspace* files and subtrees are pruned only under .obsidian/
+    assert actual == sorted([
+        str(Path(".obsidian/app.json")),
+        str(Path("notes/workspace.json")),
+        "workspace.md",
+    ])
+    # The symlinked directory is neither descended nor listed as a file
+    assert not any(rel.startswith("linked") for rel in actual)